@@ -1,45 +1,83 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import io
 import logging
-import os
-import subprocess
-import tempfile
+import pathlib
 
+import machine
 import pytest
+import translator
+
+
+def text_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode()).hexdigest()
+
+
+@pytest.fixture(scope="session")
+def interruption_handler_file(tmp_path_factory):
+    """Файлы обработчиков прерываний, общие для всех golden-тестов.
+
+    Одинаковые обработчики записываются на диск один раз за сессию."""
+    handlers_dir = tmp_path_factory.mktemp("handlers")
+    handler_files: dict[str, pathlib.Path] = {}
+
+    def get_file(handler_code: str) -> pathlib.Path:
+        code_hash = text_hash(handler_code)
+        if code_hash not in handler_files:
+            handler_file = handlers_dir / f"{code_hash}.o"
+            handler_file.write_text(handler_code, encoding="utf-8")
+            handler_files[code_hash] = handler_file
+        return handler_files[code_hash]
+
+    return get_file
+
+
+@pytest.fixture(scope="session")
+def translated_source(tmp_path_factory):
+    """Результаты трансляции golden-исходников: файл машинного кода и вывод транслятора.
+
+    Одинаковые исходники транслируются один раз за сессию."""
+    targets_dir = tmp_path_factory.mktemp("targets")
+    translations: dict[str, tuple[pathlib.Path, str]] = {}
+
+    def translate(source_code: str) -> tuple[pathlib.Path, str]:
+        source_hash = text_hash(source_code)
+        if source_hash not in translations:
+            source = targets_dir / f"{source_hash}.forthchan"
+            target = targets_dir / f"{source_hash}.o"
+            source.write_text(source_code, encoding="utf-8")
+            stdout_buffer = io.StringIO()
+            with contextlib.redirect_stdout(stdout_buffer):
+                translator.main(source, target)
+            translations[source_hash] = (target, stdout_buffer.getvalue())
+        return translations[source_hash]
+
+    return translate
 
 
 @pytest.mark.golden_test("golden/*.yml")
-def test_translator_and_machine(golden, caplog):
+def test_translator_and_machine(golden, caplog, tmp_path, interruption_handler_file, translated_source):
     caplog.set_level(logging.DEBUG)
+    caplog.handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+
+    target, stdout = translated_source(golden["in_source"])
+    input_stream = tmp_path / "input.txt"
+    read_interruption_handler = interruption_handler_file(golden["read_interruption_handler"])
+    write_interruption_handler = interruption_handler_file(golden["write_interruption_handler"])
+
+    input_stream.write_text(golden["in_stdin"], encoding="utf-8")
+
+    stdout += "============================================================\n"
+    stdout_buffer = io.StringIO()
+    with contextlib.redirect_stdout(stdout_buffer):
+        machine.main(target, input_stream, [write_interruption_handler, read_interruption_handler])
+    stdout += stdout_buffer.getvalue()
+
+    code = target.read_text(encoding="utf-8")
+    logs = caplog.text.replace("\r\n", "\n")  # как при чтении лога в текстовом режиме
 
-    with tempfile.TemporaryDirectory() as tmpdirname:
-        print(tmpdirname)
-        source = os.path.join(tmpdirname, "source.forthchan")
-        input_stream = os.path.join(tmpdirname, "input.txt")
-        target = os.path.join(tmpdirname, "target.o")
-        read_interruption_handler = os.path.join(tmpdirname, "read_interruption_handler.o")
-        write_interruption_handler = os.path.join(tmpdirname, "write_interruption_handler.o")
-
-        with open(source, "w", encoding="utf-8") as file:
-            file.write(golden["in_source"])
-        with open(input_stream, "w", encoding="utf-8") as file:
-            file.write(golden["in_stdin"])
-        with open(read_interruption_handler, "w", encoding="utf-8") as file:
-            file.write(golden["read_interruption_handler"])
-        with open(write_interruption_handler, "w", encoding="utf-8") as file:
-            file.write(golden["write_interruption_handler"])
-
-        stdout = subprocess.check_output(f"python translator.py {source} {target}", shell=True).decode()
-        stdout += "============================================================\n"
-        stdout += subprocess.check_output(
-            f"python machine.py {target} {input_stream} {write_interruption_handler} {read_interruption_handler}",
-            shell=True,
-        ).decode()
-
-        with open(target, encoding="utf-8") as file:
-            code = file.read()
-        logs = os.path.join("log.log")
-        with open(logs, encoding="utf-8") as file:
-            logs = file.read()
-
-        assert code == golden.out["out_code"]
-        assert stdout.strip() == golden.out["out_stdout"].strip()
-        assert logs.strip() == golden.out["out_log"].strip(), "Failed LOG"
+    assert code == golden.out["out_code"]
+    assert stdout.strip() == golden.out["out_stdout"].strip()
+    assert logs.strip() == golden.out["out_log"].strip(), "Failed LOG"
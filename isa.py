@@ -1,59 +1,109 @@
 from __future__ import annotations
 
 import json
-from enum import Enum
+import sys
+from enum import IntEnum
+from typing import NamedTuple
 
 
-class Opcode(str, Enum):
+class Opcode(IntEnum):
     """Коды инструкций"""
 
-    SUM = "sum"
-    DIFF = "diff"
-    DIV = "div"
-    MUL = "mul"
-    MOD = "mod"
-    EQ = "eq"
-    NEQ = "neq"
-    LESS = "less"
-    GR = "gr"
-    LE = "le"
-    GE = "ge"
-    SHIFT_BACK = "shift back"
-    SHIFT_BACK_RET = "shift back ret"
-    PUT = "put"
-    PUT_ABSOLUTE = "put absolute"
-    PICK = "pick"
-    PICK_ABSOLUTE = "pick absolute"
-    SWAP = "swap"
-    POP_TO_RET = "pop to ret"
-    PUSH_TO_OD = "push to od"
-    NUMBER = "number"
-    JMP = "jmp"
-    EXEC_IF = "exec if"
-    EXEC_COND_JMP = "exec cond jmp"
-    EXEC_COND_JMP_RET = "exec cond jmp ret"
-    DUP_RET = "dup ret"
-    DUP = "dup"
-    DUDUP = "dudup"
-    INCREMENT_RET = "increment ret"
-    DECREMENT_RET = "decrement ret"
-    JMP_POP_PRA_SHP = "jmp pop pra shp"
-    PUSH_INC_INC_IP_TO_PRA_SHP = "push inc inc ip to pra shp"
-    EQ_NOT_CONSUMING_RET = "eq not consuming ret"
-    READ_VARDATA = "read vardata"
-    WRITE_VARDATA = "write vardata"
-    SUM_TOP_WITH_VDSP = "sum top with vdsp"
-    WRITE_PORT = "write port"
-    HAS_PORT_FILLED_WITH_CPU = "has port filled with cpu"
-    READ_PORT = "read port"
-    HAS_PORT_FILLED_WITH_DEVICE = "has port filled with device"
-    HALT = "halt"
+    SUM = 0
+    DIFF = 1
+    DIV = 2
+    MUL = 3
+    MOD = 4
+    EQ = 5
+    NEQ = 6
+    LESS = 7
+    GR = 8
+    LE = 9
+    GE = 10
+    SHIFT_BACK = 11
+    SHIFT_BACK_RET = 12
+    PUT = 13
+    PUT_ABSOLUTE = 14
+    PICK = 15
+    PICK_ABSOLUTE = 16
+    SWAP = 17
+    POP_TO_RET = 18
+    PUSH_TO_OD = 19
+    NUMBER = 20
+    JMP = 21
+    EXEC_IF = 22
+    EXEC_COND_JMP = 23
+    EXEC_COND_JMP_RET = 24
+    DUP_RET = 25
+    DUP = 26
+    DUDUP = 27
+    INCREMENT_RET = 28
+    DECREMENT_RET = 29
+    JMP_POP_PRA_SHP = 30
+    PUSH_INC_INC_IP_TO_PRA_SHP = 31
+    EQ_NOT_CONSUMING_RET = 32
+    READ_VARDATA = 33
+    WRITE_VARDATA = 34
+    SUM_TOP_WITH_VDSP = 35
+    WRITE_PORT = 36
+    HAS_PORT_FILLED_WITH_CPU = 37
+    READ_PORT = 38
+    HAS_PORT_FILLED_WITH_DEVICE = 39
+    HALT = 40
 
     def __str__(self):
-        return str(self.value)
-
-
-class Term:
+        return OPCODE_MNEMONICS[self]
+
+
+OPCODE_MNEMONICS: dict[Opcode, str] = {
+    Opcode.SUM: "sum",
+    Opcode.DIFF: "diff",
+    Opcode.DIV: "div",
+    Opcode.MUL: "mul",
+    Opcode.MOD: "mod",
+    Opcode.EQ: "eq",
+    Opcode.NEQ: "neq",
+    Opcode.LESS: "less",
+    Opcode.GR: "gr",
+    Opcode.LE: "le",
+    Opcode.GE: "ge",
+    Opcode.SHIFT_BACK: "shift back",
+    Opcode.SHIFT_BACK_RET: "shift back ret",
+    Opcode.PUT: "put",
+    Opcode.PUT_ABSOLUTE: "put absolute",
+    Opcode.PICK: "pick",
+    Opcode.PICK_ABSOLUTE: "pick absolute",
+    Opcode.SWAP: "swap",
+    Opcode.POP_TO_RET: "pop to ret",
+    Opcode.PUSH_TO_OD: "push to od",
+    Opcode.NUMBER: "number",
+    Opcode.JMP: "jmp",
+    Opcode.EXEC_IF: "exec if",
+    Opcode.EXEC_COND_JMP: "exec cond jmp",
+    Opcode.EXEC_COND_JMP_RET: "exec cond jmp ret",
+    Opcode.DUP_RET: "dup ret",
+    Opcode.DUP: "dup",
+    Opcode.DUDUP: "dudup",
+    Opcode.INCREMENT_RET: "increment ret",
+    Opcode.DECREMENT_RET: "decrement ret",
+    Opcode.JMP_POP_PRA_SHP: "jmp pop pra shp",
+    Opcode.PUSH_INC_INC_IP_TO_PRA_SHP: "push inc inc ip to pra shp",
+    Opcode.EQ_NOT_CONSUMING_RET: "eq not consuming ret",
+    Opcode.READ_VARDATA: "read vardata",
+    Opcode.WRITE_VARDATA: "write vardata",
+    Opcode.SUM_TOP_WITH_VDSP: "sum top with vdsp",
+    Opcode.WRITE_PORT: "write port",
+    Opcode.HAS_PORT_FILLED_WITH_CPU: "has port filled with cpu",
+    Opcode.READ_PORT: "read port",
+    Opcode.HAS_PORT_FILLED_WITH_DEVICE: "has port filled with device",
+    Opcode.HALT: "halt",
+}
+"Строковые представления кодов инструкций в файле машинного кода"
+
+OPCODE_BY_MNEMONIC: dict[str, Opcode] = {mnemonic: opcode for opcode, mnemonic in OPCODE_MNEMONICS.items()}
+
+
+class Term(NamedTuple):
     """Описание выражения из исходного текста программы"""
 
     line_number: int
@@ -65,13 +115,8 @@ class Term:
     name: str
     "Название команды"
 
-    def __init__(self, line_number: int, line_position: int, name: str):
-        self.line_number = line_number
-        self.line_position = line_position
-        self.name = name
-
 
-class Instruction:
+class Instruction(NamedTuple):
     """Описание инструкции процессора"""
 
     index: int
@@ -86,35 +131,43 @@ class Instruction:
     term: Term
     "Описание команды высокоуровневого языка, разложенного в эту (и возможно несколько других) инструкцию"
 
-    def __init__(self, index: int, opcode: Opcode, arg: int | None, term: Term):
-        self.index = index
-        self.opcode = opcode
-        self.arg = arg
-        self.term = term
+
+def instruction_to_json_object(instruction: Instruction) -> dict:
+    """Представить инструкцию в виде JSON-объекта из встроенных типов"""
+    term = instruction.term
+    return {
+        "index": instruction.index,
+        "opcode": OPCODE_MNEMONICS[instruction.opcode],
+        "arg": instruction.arg,
+        "term": {"line_number": term.line_number, "line_position": term.line_position, "name": term.name},
+    }
+
+
+CODE_JSON_ENCODER = json.JSONEncoder()
+"Кодировщик инструкций машинного кода, общий для всех вызовов `write_code`"
 
 
 def write_code(filename: str, code: list[Instruction]):
-    """Записать код из инструкций в файл."""
+    """Записать код из инструкций в файл, по инструкции на строку."""
+    instructions_as_json = map(CODE_JSON_ENCODER.encode, map(instruction_to_json_object, code))
     with open(filename, "w", encoding="utf-8") as file:
-        code_as_json: list[str] = []
-        for instruction in code:
-            code_as_json.append(json.dumps(instruction, default=lambda o: o.__dict__))
-        file.write("[" + ",\n ".join(code_as_json) + "]")
+        file.write("[" + ",\n ".join(instructions_as_json) + "]")
+
+
+def code_json_object_hook(json_object: dict) -> Instruction | Term:
+    """Собрать инструкцию или описание терма прямо при разборе JSON машинного кода"""
+    if "opcode" in json_object:
+        arg = None
+        if json_object["arg"] is not None:
+            arg = int(json_object["arg"])
+        return Instruction(
+            int(json_object["index"]), OPCODE_BY_MNEMONIC[json_object["opcode"]], arg, json_object["term"]
+        )
+    # имена команд сильно повторяются в программе, поэтому храним по одной копии каждого
+    return Term(json_object["line_number"], json_object["line_position"], sys.intern(json_object["name"]))
 
 
 def read_code(filename: str) -> list[Instruction]:
     """Прочесть машинный код из файла"""
     with open(filename, encoding="utf-8") as file:
-        code_json_objects = json.loads(file.read())
-    code: list[Instruction] = []
-    for instruction_json in code_json_objects:
-        index = int(instruction_json["index"])
-        opcode = Opcode(instruction_json["opcode"])
-        arg = None
-        if instruction_json["arg"] is not None:
-            arg = int(instruction_json["arg"])
-        term_as_dict = instruction_json["term"]
-        assert len(term_as_dict) == 3
-        term = Term(term_as_dict["line_number"], term_as_dict["line_position"], term_as_dict["name"])
-        code.append(Instruction(index, opcode, arg, term))
-    return code
+        return json.load(file, object_hook=code_json_object_hook)
@@ -1,20 +1,29 @@
 from __future__ import annotations
 
+import argparse
 import logging
-import sys
-import typing
+from collections.abc import Callable
 from enum import Enum
 
 from isa import Instruction, Opcode, read_code
 
 
 class Port:
-    filled_with_device: bool = False
-    filled_with_cpu: bool = False
-    data: int = 0
+    __slots__ = ("filled_with_device", "filled_with_cpu", "data")
+
+    filled_with_device: bool
+    filled_with_cpu: bool
+    data: int
+
+    def __init__(self):
+        self.filled_with_device = False
+        self.filled_with_cpu = False
+        self.data = 0
 
 
 class InterruptablePort:
+    __slots__ = ("port", "interrupt_code_on_write", "interrupt_code_on_read")
+
     port: Port
     interrupt_code_on_write: list[Instruction]
     interrupt_code_on_read: list[Instruction]
@@ -58,8 +67,18 @@ class LatchInput(str, Enum):
     VDSP_PLUS_TOP = "VDSP PLUS TOP"
 
 
-def signal_convert(input_number: int):
-    return 1 if input_number == 0 else 0
+OD_SHP_LATCH_DELTAS: dict[LatchInput, int] = {
+    LatchInput.OD_SHP_INC: 1,
+    LatchInput.OD_SHP_DEC: -1,
+    LatchInput.OD_SHP_MINUS_TWO: -2,
+}
+"Изменение OD SHP по входу защелки"
+
+PRA_SHP_LATCH_DELTAS: dict[LatchInput, int] = {
+    LatchInput.PRA_SHP_INC: 1,
+    LatchInput.PRA_SHP_DEC: -1,
+}
+"Изменение PRA SHP по входу защелки"
 
 
 class DataPath:
@@ -87,7 +106,7 @@ class DataPath:
     instruction_stage_number: int = None
     "Instruction Stage Number - счетчик стадий команды"
 
-    ports: typing.ClassVar[list[Port]] = []
+    ports: list[Port] = None
     "Порты"
 
     var_data_start_point: int = None
@@ -95,6 +114,8 @@ class DataPath:
     is_in_interruption: bool = False
 
     class RegsState:
+        __slots__ = ("ip", "od_shp", "pra_shp", "top", "next")
+
         ip: int
         od_shp: int
         pra_shp: int
@@ -108,7 +129,7 @@ class DataPath:
             self.top = top_reg
             self.next = next_reg
 
-    cur_tick_regs_state: RegsState = RegsState()
+    cur_tick_regs_state: RegsState = None
 
     def __init__(
         self,
@@ -120,6 +141,8 @@ class DataPath:
         assert memory_size > 0, "Data_memory size should be non-zero"
         self.data_memory = [0] * memory_size
         assert len(ports_description) != 0, "Not enough ports for built-in instructions"
+        self.ports = [port_description.port for port_description in ports_description]
+        self.cur_tick_regs_state = DataPath.RegsState()
         procedures_points_table: list[int] = []
         procedure_start_point = 2 * len(ports_description)
         for port_description in ports_description:
@@ -129,9 +152,7 @@ class DataPath:
             procedures_points_table.append(procedure_start_point)
             self.write_code(procedure_start_point, port_description.interrupt_code_on_read)
             procedure_start_point += len(port_description.interrupt_code_on_read)
-            self.ports.append(port_description.port)
-        for i in range(0, len(procedures_points_table)):
-            self.data_memory[i] = procedures_points_table[i]
+        self.data_memory[: len(procedures_points_table)] = procedures_points_table
         self.var_data_start_point = procedure_start_point
         self.instruction_pointer = self.var_data_start_point + var_memory_size
         self.write_code(self.instruction_pointer, program)
@@ -142,192 +163,105 @@ class DataPath:
         logging.debug(f"{self.var_data_start_point}, {self.instruction_pointer}, {self.od_sh_pointer}")
 
     def write_code(self, memory_index: int, code: list[Instruction]):
-        for instruction in code:
-            self.data_memory[memory_index] = instruction
-            memory_index += 1
+        assert memory_index + len(code) <= len(self.data_memory), "Not enough data_memory for code"
+        self.data_memory[memory_index : memory_index + len(code)] = code
 
     def latch_ip(self, instruction: Instruction, latch_input: LatchInput):
+        # входы упорядочены по частоте: IP INC защелкивается последним тиком почти каждой инструкции
         match latch_input:
-            case LatchInput.TOP:
-                self.instruction_pointer = self.cur_tick_regs_state.top
+            case LatchInput.IP_INC:
+                self.instruction_pointer += 1
+            case LatchInput.IP_PLUS_ARG:
+                self.instruction_pointer += instruction.arg
             case LatchInput.IP_CONV_SIG_SUM_INC:
-                top_conv_sig = 1 if self.cur_tick_regs_state.top == 0 else 0
-                pra_ma_out_conv_sig = 1 if self.data_memory[self.cur_tick_regs_state.pra_shp] == 0 else 0
+                regs_state = self.cur_tick_regs_state
                 match instruction.opcode:
                     case Opcode.EXEC_IF:
+                        top_conv_sig = 1 if regs_state.top == 0 else 0
                         self.instruction_pointer += 1 + top_conv_sig
                     case Opcode.EXEC_COND_JMP:
+                        top_conv_sig = 1 if regs_state.top == 0 else 0
                         self.instruction_pointer += 1 + (0 if top_conv_sig == 1 else instruction.arg)
                     case Opcode.EXEC_COND_JMP_RET:
+                        pra_ma_out_conv_sig = 1 if self.data_memory[regs_state.pra_shp] == 0 else 0
                         self.instruction_pointer += 1 + (0 if pra_ma_out_conv_sig == 1 else instruction.arg)
                     case _:
                         raise "fatal"
+            case LatchInput.TOP:
+                self.instruction_pointer = self.cur_tick_regs_state.top
             case LatchInput.IP_MINUS_TOP:
                 self.instruction_pointer -= self.cur_tick_regs_state.top
-            case LatchInput.IP_PLUS_ARG:
-                self.instruction_pointer += instruction.arg
-            case LatchInput.IP_INC:
-                self.instruction_pointer += 1
             case _:
                 raise "fatal"
 
     def latch_od_shp(self, latch_input: LatchInput):
-        match latch_input:
-            case LatchInput.OD_SHP_INC:
-                self.od_sh_pointer += 1
-            case LatchInput.OD_SHP_DEC:
-                self.od_sh_pointer -= 1
-            case LatchInput.OD_SHP_MINUS_TWO:
-                self.od_sh_pointer -= 2
-            case _:
-                raise "fatal"
+        self.od_sh_pointer += OD_SHP_LATCH_DELTAS[latch_input]
 
     def latch_pra_shp(self, latch_input: LatchInput):
-        match latch_input:
-            case LatchInput.PRA_SHP_INC:
-                self.pra_shp_pointer += 1
-            case LatchInput.PRA_SHP_DEC:
-                self.pra_shp_pointer -= 1
-            case _:
-                raise "fatal"
-        pass
+        self.pra_shp_pointer += PRA_SHP_LATCH_DELTAS[latch_input]
 
     def latch_top(self, instruction: Instruction, latch_input: LatchInput):
-        port_num = instruction.arg
+        regs_state = self.cur_tick_regs_state
         match latch_input:
             case LatchInput.ALU_OUT:
-                match instruction.opcode:
-                    case Opcode.SUM:
-                        self.top = self.cur_tick_regs_state.next + self.cur_tick_regs_state.top
-                    case Opcode.DIFF:
-                        self.top = self.cur_tick_regs_state.next - self.cur_tick_regs_state.top
-                    case Opcode.DIV:
-                        self.top = self.cur_tick_regs_state.next // self.cur_tick_regs_state.top
-                    case Opcode.MUL:
-                        self.top = self.cur_tick_regs_state.next * self.cur_tick_regs_state.top
-                    case Opcode.MOD:
-                        self.top = self.cur_tick_regs_state.next % self.cur_tick_regs_state.top
-                    case Opcode.EQ:
-                        self.top = 0 if self.cur_tick_regs_state.next == self.cur_tick_regs_state.top else -1
-                    case Opcode.NEQ:
-                        self.top = 0 if self.cur_tick_regs_state.next != self.cur_tick_regs_state.top else -1
-                    case Opcode.LESS:
-                        self.top = 0 if self.cur_tick_regs_state.next < self.cur_tick_regs_state.top else -1
-                    case Opcode.GR:
-                        self.top = 0 if self.cur_tick_regs_state.next > self.cur_tick_regs_state.top else -1
-                    case Opcode.LE:
-                        self.top = 0 if self.cur_tick_regs_state.next <= self.cur_tick_regs_state.top else -1
-                    case Opcode.GE:
-                        self.top = 0 if self.cur_tick_regs_state.next >= self.cur_tick_regs_state.top else -1
-                    case Opcode.SHIFT_BACK:
-                        self.top = self.cur_tick_regs_state.next
-                    case Opcode.EQ_NOT_CONSUMING_RET:
-                        match self.instruction_stage_number:
-                            case 1:
-                                self.top = (
-                                    0
-                                    if (
-                                        self.data_memory[self.cur_tick_regs_state.pra_shp + 1]
-                                        == self.data_memory[self.cur_tick_regs_state.pra_shp]
-                                    )
-                                    else -1
-                                )
-                            case 3:
-                                self.top = self.data_memory[self.cur_tick_regs_state.od_shp]
-                            case _:
-                                raise "fatal"
-                    case _:
-                        raise "fatal"
+                if instruction.opcode == Opcode.EQ_NOT_CONSUMING_RET:
+                    self.top = self.eq_not_consuming_ret_alu_out()
+                else:
+                    alu_operation = ALU_OPERATIONS[instruction.opcode]
+                    self.top = alu_operation(regs_state.next, regs_state.top)
             case LatchInput.HAS_DEVICE_FILLED_WITH_CPU:
-                self.top = 0 if self.ports[port_num].filled_with_cpu else -1
+                self.top = 0 if self.ports[instruction.arg].filled_with_cpu else -1
             case LatchInput.HAS_PORT_FILLED_WITH_DEVICE:
-                self.top = 0 if self.ports[port_num].filled_with_device else -1
+                self.top = 0 if self.ports[instruction.arg].filled_with_device else -1
             case LatchInput.NEXT:
-                self.top = self.cur_tick_regs_state.next
+                self.top = regs_state.next
             case LatchInput.MA_OUT:
-                match instruction.opcode:
-                    case Opcode.PUT | Opcode.PUT_ABSOLUTE:
-                        self.top = self.data_memory[self.cur_tick_regs_state.od_shp]
-                    case Opcode.PICK:
-                        self.top = self.data_memory[self.cur_tick_regs_state.od_shp - self.cur_tick_regs_state.top - 1]
-                    case Opcode.PICK_ABSOLUTE:
-                        self.top = self.data_memory[self.cur_tick_regs_state.top]
-                    case Opcode.PUSH_TO_OD:
-                        self.top = self.data_memory[self.cur_tick_regs_state.pra_shp]
-                    case Opcode.DUP_RET | Opcode.INCREMENT_RET | Opcode.DECREMENT_RET:
-                        match self.instruction_stage_number:
-                            case 1:
-                                self.top = self.data_memory[self.cur_tick_regs_state.pra_shp]
-                            case 3:
-                                self.top = self.data_memory[self.cur_tick_regs_state.od_shp]
-                            case _:
-                                raise "fatal"
-                    case Opcode.JMP_POP_PRA_SHP:
-                        match self.instruction_stage_number:
-                            case 1:
-                                self.top = self.data_memory[self.cur_tick_regs_state.pra_shp]
-                            case 2:
-                                self.top = self.data_memory[self.cur_tick_regs_state.od_shp]
-                            case _:
-                                raise "fatal"
-                    case Opcode.READ_VARDATA:
-                        self.top = self.data_memory[self.var_data_start_point + instruction.arg]
+                address = TOP_LATCH_MA_OUT_ADDRESSES.get(instruction.opcode)
+                if address is not None:
+                    self.top = self.data_memory[address(self, instruction)]
             case LatchInput.ARG:
                 self.top = instruction.arg
             case LatchInput.VDSP_PLUS_TOP:
-                self.top = self.var_data_start_point + self.cur_tick_regs_state.top
+                self.top = to_machine_word(self.var_data_start_point + regs_state.top)
             case LatchInput.PORT_VALUE:
                 self.top = self.ports[instruction.arg].data
             case _:
                 raise "fatal"
 
+    def eq_not_consuming_ret_alu_out(self) -> int:
+        regs_state = self.cur_tick_regs_state
+        match self.instruction_stage_number:
+            case 1:
+                return 0 if self.data_memory[regs_state.pra_shp + 1] == self.data_memory[regs_state.pra_shp] else -1
+            case 3:
+                return self.data_memory[regs_state.od_shp]
+            case _:
+                raise "fatal"
+
     def latch_next(self, instruction: Instruction, latch_input: LatchInput):
         match latch_input:
             case LatchInput.TOP:
                 self.next = self.cur_tick_regs_state.top
             case LatchInput.MA_MINUS_ONE_OUT:
-                match instruction.opcode:
-                    case Opcode.PUT | Opcode.PUT_ABSOLUTE:
-                        self.next = self.data_memory[self.cur_tick_regs_state.top - 1]
-                    case Opcode.PUSH_TO_OD:
-                        self.next = self.data_memory[self.cur_tick_regs_state.od_shp - 1]
-                    case Opcode.EXEC_IF | Opcode.EXEC_COND_JMP:
-                        self.next = self.data_memory[self.cur_tick_regs_state.od_shp - 1 - 1]
-                    case Opcode.WRITE_VARDATA | Opcode.WRITE_PORT:
-                        self.next = self.data_memory[self.cur_tick_regs_state.od_shp - 1 - 1]
-                    case Opcode.POP_TO_RET:
-                        self.next = self.data_memory[self.cur_tick_regs_state.od_shp - 1]
-                    case _:
-                        logging.debug(instruction.opcode)
-                        raise instruction.opcode
-                        # raise "fatal"
+                address = NEXT_LATCH_MA_MINUS_ONE_OUT_ADDRESSES.get(instruction.opcode)
+                if address is None:
+                    logging.debug(instruction.opcode)
+                    raise instruction.opcode
+                self.next = self.data_memory[address(self, instruction)]
             case LatchInput.MA_OUT:
-                match instruction.opcode:
-                    case (
-                        Opcode.SUM
-                        | Opcode.DIFF
-                        | Opcode.DIV
-                        | Opcode.MUL
-                        | Opcode.MOD
-                        | Opcode.EQ
-                        | Opcode.NEQ
-                        | Opcode.LESS
-                        | Opcode.GR
-                        | Opcode.LE
-                        | Opcode.GE
-                    ):
-                        self.next = self.data_memory[self.cur_tick_regs_state.od_shp - 2]
-                    case Opcode.SHIFT_BACK:
-                        self.next = self.data_memory[self.cur_tick_regs_state.od_shp - 1]
+                address = NEXT_LATCH_MA_OUT_ADDRESSES.get(instruction.opcode)
+                if address is not None:
+                    self.next = self.data_memory[address(self, instruction)]
             case _:
                 raise "fatal"
 
     def latch_memory_data(self, instruction: Instruction, latch_input: LatchInput):
+        regs_state = self.cur_tick_regs_state
         match latch_input:
             case LatchInput.HAS_PORT_FILLED_WITH_DEVICE | LatchInput.HAS_DEVICE_FILLED_WITH_CPU | LatchInput.PORT_VALUE:
                 self.port_latch_on_memory_data(instruction, latch_input)
             case LatchInput.ARG:
-                self.data_memory[self.cur_tick_regs_state.od_shp + 1] = instruction.arg
+                self.data_memory[regs_state.od_shp + 1] = instruction.arg
             case LatchInput.TOP:
                 self.top_latch_on_memory_data(instruction)
             case LatchInput.NEXT:
@@ -335,88 +269,39 @@ class DataPath:
             case LatchInput.ALU_OUT:
                 match instruction.opcode:
                     case Opcode.INCREMENT_RET:
-                        self.data_memory[self.cur_tick_regs_state.pra_shp] = self.cur_tick_regs_state.top + 1
+                        self.data_memory[regs_state.pra_shp] = to_machine_word(regs_state.top + 1)
                     case Opcode.DECREMENT_RET:
-                        self.data_memory[self.cur_tick_regs_state.pra_shp] = self.cur_tick_regs_state.top - 1
+                        self.data_memory[regs_state.pra_shp] = to_machine_word(regs_state.top - 1)
                     case _:
                         raise "fatal"
             case LatchInput.IP_PLUS_TWO:
-                self.data_memory[self.cur_tick_regs_state.pra_shp - 1] = self.cur_tick_regs_state.ip + 2
+                self.data_memory[regs_state.pra_shp - 1] = regs_state.ip + 2
             case LatchInput.VDSP_PLUS_TOP:
-                self.data_memory[self.cur_tick_regs_state.od_shp] = (
-                    self.var_data_start_point + self.cur_tick_regs_state.top
-                )
+                self.data_memory[regs_state.od_shp] = to_machine_word(self.var_data_start_point + regs_state.top)
             case _:
                 raise "fatal"
 
     def top_latch_on_memory_data(self, instruction: Instruction):
-        match instruction.opcode:
-            case (
-                Opcode.SUM
-                | Opcode.DIFF
-                | Opcode.DIV
-                | Opcode.MUL
-                | Opcode.MOD
-                | Opcode.EQ
-                | Opcode.NEQ
-                | Opcode.LESS
-                | Opcode.GR
-                | Opcode.LE
-                | Opcode.GE
-            ):
-                self.data_memory[self.cur_tick_regs_state.od_shp] = self.cur_tick_regs_state.top
-            case Opcode.PICK | Opcode.PICK_ABSOLUTE:
-                self.data_memory[self.cur_tick_regs_state.od_shp] = self.cur_tick_regs_state.top
-            case Opcode.SWAP:
-                match self.instruction_stage_number:
-                    case 1:
-                        self.data_memory[self.cur_tick_regs_state.od_shp - 1] = self.cur_tick_regs_state.top
-                    case 2:
-                        self.data_memory[self.cur_tick_regs_state.od_shp] = self.cur_tick_regs_state.top
-            case Opcode.POP_TO_RET:
-                self.data_memory[self.cur_tick_regs_state.pra_shp - 1] = self.cur_tick_regs_state.top
-            case Opcode.PUSH_TO_OD:
-                self.data_memory[self.cur_tick_regs_state.od_shp] = self.cur_tick_regs_state.top
-            case Opcode.DUP_RET:
-                self.data_memory[self.cur_tick_regs_state.pra_shp + 1] = self.cur_tick_regs_state.top
-            case Opcode.DUP:
-                self.data_memory[self.cur_tick_regs_state.od_shp + 1] = self.cur_tick_regs_state.top
-            case Opcode.DUDUP:
-                self.data_memory[self.cur_tick_regs_state.od_shp + 1] = self.cur_tick_regs_state.top
-            case Opcode.EQ_NOT_CONSUMING_RET:
-                self.data_memory[self.cur_tick_regs_state.pra_shp] = self.cur_tick_regs_state.top
-            case Opcode.WRITE_VARDATA:
-                self.data_memory[self.var_data_start_point + instruction.arg] = self.cur_tick_regs_state.top
-            case Opcode.READ_VARDATA:
-                self.data_memory[self.cur_tick_regs_state.od_shp + 1] = self.cur_tick_regs_state.top
-            case _:
-                raise "fatal"
+        address = TOP_STORE_ADDRESSES.get(instruction.opcode)
+        if address is None:
+            raise "fatal"
+        self.data_memory[address(self, instruction)] = self.cur_tick_regs_state.top
 
     def next_latch_on_memory_data(self, instruction: Instruction):
-        match instruction.opcode:
-            case Opcode.PUT:
-                self.data_memory[
-                    self.cur_tick_regs_state.od_shp - self.cur_tick_regs_state.top - 2
-                ] = self.cur_tick_regs_state.next
-            case Opcode.PUT_ABSOLUTE:
-                self.data_memory[self.cur_tick_regs_state.top] = self.cur_tick_regs_state.next
-            case Opcode.DUDUP:
-                self.data_memory[self.cur_tick_regs_state.od_shp + 1] = self.cur_tick_regs_state.next
-            case _:
-                raise "fatal"
+        address = NEXT_STORE_ADDRESSES.get(instruction.opcode)
+        if address is None:
+            raise "fatal"
+        self.data_memory[address(self, instruction)] = self.cur_tick_regs_state.next
 
     def port_latch_on_memory_data(self, instruction: Instruction, latch_input: LatchInput):
+        regs_state = self.cur_tick_regs_state
         match latch_input:
             case LatchInput.HAS_DEVICE_FILLED_WITH_CPU:
-                self.data_memory[self.cur_tick_regs_state.od_shp + 1] = (
-                    0 if self.ports[instruction.arg].filled_with_cpu else -1
-                )
+                self.data_memory[regs_state.od_shp + 1] = 0 if self.ports[instruction.arg].filled_with_cpu else -1
             case LatchInput.HAS_PORT_FILLED_WITH_DEVICE:
-                self.data_memory[self.cur_tick_regs_state.od_shp + 1] = (
-                    0 if self.ports[instruction.arg].filled_with_cpu else -1
-                )
+                self.data_memory[regs_state.od_shp + 1] = 0 if self.ports[instruction.arg].filled_with_cpu else -1
             case LatchInput.PORT_VALUE:
-                self.data_memory[self.cur_tick_regs_state.od_shp + 1] = self.ports[instruction.arg].data
+                self.data_memory[regs_state.od_shp + 1] = self.ports[instruction.arg].data
             case _:
                 raise "fatal"
 
@@ -465,6 +350,144 @@ class DataPath:
                 raise "fatal exception"
 
 
+MACHINE_WORD_MODULUS = 2**64
+"Количество значений 64-битного машинного слова"
+
+MACHINE_WORD_MIN = -(2**63)
+"Минимальное значение знакового машинного слова"
+
+
+def to_machine_word(value: int) -> int:
+    """Привести результат вычисления к знаковому 64-битному машинному слову (переполнение по модулю 2^64)
+
+    >>> to_machine_word(2**63)
+    -9223372036854775808
+    >>> to_machine_word(-(2**63) - 1)
+    9223372036854775807
+    >>> to_machine_word(-(2**63) // -1)
+    -9223372036854775808
+    >>> to_machine_word(-5)
+    -5
+    """
+    return (value - MACHINE_WORD_MIN) % MACHINE_WORD_MODULUS + MACHINE_WORD_MIN
+
+
+ALU_OPERATIONS: dict[Opcode, Callable[[int, int], int]] = {
+    Opcode.SUM: lambda next_value, top_value: to_machine_word(next_value + top_value),
+    Opcode.DIFF: lambda next_value, top_value: to_machine_word(next_value - top_value),
+    Opcode.DIV: lambda next_value, top_value: to_machine_word(next_value // top_value),
+    Opcode.MUL: lambda next_value, top_value: to_machine_word(next_value * top_value),
+    Opcode.MOD: lambda next_value, top_value: next_value % top_value,
+    Opcode.EQ: lambda next_value, top_value: 0 if next_value == top_value else -1,
+    Opcode.NEQ: lambda next_value, top_value: 0 if next_value != top_value else -1,
+    Opcode.LESS: lambda next_value, top_value: 0 if next_value < top_value else -1,
+    Opcode.GR: lambda next_value, top_value: 0 if next_value > top_value else -1,
+    Opcode.LE: lambda next_value, top_value: 0 if next_value <= top_value else -1,
+    Opcode.GE: lambda next_value, top_value: 0 if next_value >= top_value else -1,
+    Opcode.SHIFT_BACK: lambda next_value, _: next_value,
+}
+"Операции АЛУ над значениями NEXT и TOP, результат которых защелкивается в TOP по сигналу ALU OUT"
+
+MemoryAddress = Callable[[DataPath, Instruction], int]
+"Вычисление адреса ячейки памяти по состоянию регистров на текущем такте и инструкции"
+
+
+def by_stage(stages_addresses: dict[int, MemoryAddress]) -> MemoryAddress:
+    """Адрес, зависящий от стадии исполнения инструкции"""
+
+    def address(data_path: DataPath, instruction: Instruction) -> int:
+        return stages_addresses[data_path.instruction_stage_number](data_path, instruction)
+
+    return address
+
+
+def od_shp_address(offset: int) -> MemoryAddress:
+    return lambda data_path, _: data_path.cur_tick_regs_state.od_shp + offset
+
+
+def pra_shp_address(offset: int) -> MemoryAddress:
+    return lambda data_path, _: data_path.cur_tick_regs_state.pra_shp + offset
+
+
+def top_address(offset: int) -> MemoryAddress:
+    return lambda data_path, _: data_path.cur_tick_regs_state.top + offset
+
+
+def vardata_arg_address(data_path: DataPath, instruction: Instruction) -> int:
+    return data_path.var_data_start_point + instruction.arg
+
+
+ALU_OPERANDS_OPCODES = (
+    Opcode.SUM,
+    Opcode.DIFF,
+    Opcode.DIV,
+    Opcode.MUL,
+    Opcode.MOD,
+    Opcode.EQ,
+    Opcode.NEQ,
+    Opcode.LESS,
+    Opcode.GR,
+    Opcode.LE,
+    Opcode.GE,
+)
+"Инструкции, берущие оба операнда АЛУ с вершины стека данных"
+
+TOP_LATCH_MA_OUT_ADDRESSES: dict[Opcode, MemoryAddress] = {
+    Opcode.PUT: od_shp_address(0),
+    Opcode.PUT_ABSOLUTE: od_shp_address(0),
+    Opcode.PICK: lambda data_path, _: (data_path.cur_tick_regs_state.od_shp - data_path.cur_tick_regs_state.top - 1),
+    Opcode.PICK_ABSOLUTE: top_address(0),
+    Opcode.PUSH_TO_OD: pra_shp_address(0),
+    Opcode.DUP_RET: by_stage({1: pra_shp_address(0), 3: od_shp_address(0)}),
+    Opcode.INCREMENT_RET: by_stage({1: pra_shp_address(0), 3: od_shp_address(0)}),
+    Opcode.DECREMENT_RET: by_stage({1: pra_shp_address(0), 3: od_shp_address(0)}),
+    Opcode.JMP_POP_PRA_SHP: by_stage({1: pra_shp_address(0), 2: od_shp_address(0)}),
+    Opcode.READ_VARDATA: vardata_arg_address,
+}
+"Адреса ячеек памяти, значение из которых защелкивается в TOP по сигналу MA OUT"
+
+NEXT_LATCH_MA_MINUS_ONE_OUT_ADDRESSES: dict[Opcode, MemoryAddress] = {
+    Opcode.PUT: top_address(-1),
+    Opcode.PUT_ABSOLUTE: top_address(-1),
+    Opcode.PUSH_TO_OD: od_shp_address(-1),
+    Opcode.EXEC_IF: od_shp_address(-2),
+    Opcode.EXEC_COND_JMP: od_shp_address(-2),
+    Opcode.WRITE_VARDATA: od_shp_address(-2),
+    Opcode.WRITE_PORT: od_shp_address(-2),
+    Opcode.POP_TO_RET: od_shp_address(-1),
+}
+"Адреса ячеек памяти, значение из которых защелкивается в NEXT по сигналу MA MINUS ONE OUT"
+
+NEXT_LATCH_MA_OUT_ADDRESSES: dict[Opcode, MemoryAddress] = {
+    **dict.fromkeys(ALU_OPERANDS_OPCODES, od_shp_address(-2)),
+    Opcode.SHIFT_BACK: od_shp_address(-1),
+}
+"Адреса ячеек памяти, значение из которых защелкивается в NEXT по сигналу MA OUT"
+
+TOP_STORE_ADDRESSES: dict[Opcode, MemoryAddress] = {
+    **dict.fromkeys(ALU_OPERANDS_OPCODES, od_shp_address(0)),
+    Opcode.PICK: od_shp_address(0),
+    Opcode.PICK_ABSOLUTE: od_shp_address(0),
+    Opcode.SWAP: by_stage({1: od_shp_address(-1), 2: od_shp_address(0)}),
+    Opcode.POP_TO_RET: pra_shp_address(-1),
+    Opcode.PUSH_TO_OD: od_shp_address(0),
+    Opcode.DUP_RET: pra_shp_address(1),
+    Opcode.DUP: od_shp_address(1),
+    Opcode.DUDUP: od_shp_address(1),
+    Opcode.EQ_NOT_CONSUMING_RET: pra_shp_address(0),
+    Opcode.WRITE_VARDATA: vardata_arg_address,
+    Opcode.READ_VARDATA: od_shp_address(1),
+}
+"Адреса ячеек памяти, в которые записывается значение TOP по сигналу TOP на входе памяти"
+
+NEXT_STORE_ADDRESSES: dict[Opcode, MemoryAddress] = {
+    Opcode.PUT: lambda data_path, _: (data_path.cur_tick_regs_state.od_shp - data_path.cur_tick_regs_state.top - 2),
+    Opcode.PUT_ABSOLUTE: top_address(0),
+    Opcode.DUDUP: od_shp_address(1),
+}
+"Адреса ячеек памяти, в которые записывается значение NEXT по сигналу NEXT на входе памяти"
+
+
 class ControlUnit:
     """Блок управления процессора. Выполняет декодирование инструкций и
     управляет состоянием модели процессора, включая обработку данных (DataPath).
@@ -481,408 +504,362 @@ class ControlUnit:
     def __init__(self, data_path: DataPath):
         self.data_path = data_path
 
-    def current_instruction(self):
-        return self.data_path.data_memory[self.data_path.instruction_pointer]
-
     def tick(self):
         self.data_path.signal_increment_instruction_stage_number()
 
     def next_tick_execute(self) -> bool:
         """Основной цикл процессора. Декодирует и выполняет тик инструкции
         (возвращает истину если тик был последним в инструкции)"""
-        instruction = self.current_instruction()
-        self.data_path.cur_tick_regs_state.save(
-            self.data_path.instruction_pointer,
-            self.data_path.od_sh_pointer,
-            self.data_path.pra_shp_pointer,
-            self.data_path.top,
-            self.data_path.next,
+        data_path = self.data_path
+        instruction = data_path.data_memory[data_path.instruction_pointer]
+        data_path.cur_tick_regs_state.save(
+            data_path.instruction_pointer,
+            data_path.od_sh_pointer,
+            data_path.pra_shp_pointer,
+            data_path.top,
+            data_path.next,
         )
 
-        is_last_instruction_tick = False
-        match instruction.opcode:
-            case Opcode.HALT:
-                if not self.data_path.is_in_interruption:
-                    raise StopIteration()
-                self.data_path.instruction_stage_number = self.data_path.data_memory[self.data_path.pra_shp_pointer]
-                self.data_path.pra_shp_pointer += 1
-                self.data_path.instruction_pointer = self.data_path.data_memory[self.data_path.pra_shp_pointer]
-                self.data_path.pra_shp_pointer += 1
-                self.ticks_counter += 1  # 2 ticks to restore
-                self.data_path.latch_is_in_interruption(LatchInput.FALSE)
-                logging.debug("Interruption exit!!!")
-                return True
-
-            case Opcode.DUP_RET | Opcode.DUP | Opcode.DUDUP:
-                is_last_instruction_tick = self.dup_instructions_exec(instruction)
-
-            case Opcode.JMP | Opcode.JMP_POP_PRA_SHP | Opcode.EXEC_IF | Opcode.EXEC_COND_JMP_RET | Opcode.EXEC_COND_JMP:
-                is_last_instruction_tick = self.ip_changing_instructions_exec(instruction)
-
-            case (
-                Opcode.NUMBER
-                | Opcode.SUM
-                | Opcode.DIFF
-                | Opcode.DIV
-                | Opcode.MUL
-                | Opcode.MOD
-                | Opcode.EQ
-                | Opcode.NEQ
-                | Opcode.LESS
-                | Opcode.GR
-                | Opcode.LE
-                | Opcode.GE
-                | Opcode.SHIFT_BACK
-                | Opcode.PUT
-                | Opcode.PUT_ABSOLUTE
-                | Opcode.PICK
-                | Opcode.PICK_ABSOLUTE
-                | Opcode.SWAP
-            ):
-                is_last_instruction_tick = self.full_data_instractions_exec(instruction)
-
-            case (
-                Opcode.PUSH_INC_INC_IP_TO_PRA_SHP
-                | Opcode.INCREMENT_RET
-                | Opcode.DECREMENT_RET
-                | Opcode.EQ_NOT_CONSUMING_RET
-                | Opcode.POP_TO_RET
-                | Opcode.PUSH_TO_OD
-                | Opcode.SHIFT_BACK_RET
-            ):
-                is_last_instruction_tick = self.pra_maniputation_instractions_exec(instruction)
-
-            case (
-                Opcode.READ_PORT
-                | Opcode.WRITE_PORT
-                | Opcode.HAS_PORT_FILLED_WITH_CPU
-                | Opcode.HAS_PORT_FILLED_WITH_DEVICE
-            ):
-                is_last_instruction_tick = self.port_instructions_exec(instruction)
-
-            case Opcode.READ_VARDATA | Opcode.WRITE_VARDATA | Opcode.SUM_TOP_WITH_VDSP:
-                is_last_instruction_tick = self.vardata_instructions_exec(instruction)
+        if instruction.opcode == Opcode.HALT:
+            if not data_path.is_in_interruption:
+                raise StopIteration()
+            data_path.instruction_stage_number = data_path.data_memory[data_path.pra_shp_pointer]
+            data_path.pra_shp_pointer += 1
+            data_path.instruction_pointer = data_path.data_memory[data_path.pra_shp_pointer]
+            data_path.pra_shp_pointer += 1
+            self.ticks_counter += 1  # 2 ticks to restore
+            data_path.latch_is_in_interruption(LatchInput.FALSE)
+            logging.debug("Interruption exit!!!")
+            return True
 
-            case _:
-                raise "fatal exception"
+        is_last_instruction_tick = INSTRUCTION_EXECUTORS[instruction.opcode](self, instruction)
 
         self.ticks_counter += 1
         if is_last_instruction_tick:
-            self.data_path.signal_reset_instruction_stage_number()
+            # одностадийные инструкции не меняют номер стадии, сбрасывать его нужно только после многостадийных
+            if data_path.instruction_stage_number != 1:
+                data_path.signal_reset_instruction_stage_number()
             self.instructions_counter += 1
         else:
             self.tick()
         return is_last_instruction_tick
 
-    def full_data_instractions_exec(self, instruction: Instruction) -> bool:
-        match instruction.opcode:
-            case Opcode.NUMBER:
-                self.data_path.latch_next(instruction, LatchInput.TOP)
-                self.data_path.latch_memory_data(instruction, LatchInput.ARG)
-                self.data_path.latch_top(instruction, LatchInput.ARG)
-                self.data_path.latch_od_shp(LatchInput.OD_SHP_INC)
-                self.data_path.latch_ip(instruction, LatchInput.IP_INC)
+    def number_exec(self, instruction: Instruction) -> bool:
+        data_path = self.data_path
+        data_path.latch_next(instruction, LatchInput.TOP)
+        data_path.latch_memory_data(instruction, LatchInput.ARG)
+        data_path.latch_top(instruction, LatchInput.ARG)
+        data_path.latch_od_shp(LatchInput.OD_SHP_INC)
+        data_path.latch_ip(instruction, LatchInput.IP_INC)
+        return True
+
+    def alu_instruction_exec(self, instruction: Instruction) -> bool:
+        data_path = self.data_path
+        match data_path.instruction_stage_number:
+            case 1:
+                data_path.latch_top(instruction, LatchInput.ALU_OUT)
+                data_path.latch_next(instruction, LatchInput.MA_OUT)
+                data_path.latch_od_shp(LatchInput.OD_SHP_DEC)
+            case 2:
+                data_path.latch_memory_data(instruction, LatchInput.TOP)
+                data_path.latch_ip(instruction, LatchInput.IP_INC)
                 return True
-            case (
-                Opcode.SUM
-                | Opcode.DIFF
-                | Opcode.DIV
-                | Opcode.MUL
-                | Opcode.MOD
-                | Opcode.EQ
-                | Opcode.NEQ
-                | Opcode.LESS
-                | Opcode.GR
-                | Opcode.LE
-                | Opcode.GE
-            ):
-                match self.data_path.instruction_stage_number:
-                    case 1:
-                        self.data_path.latch_top(instruction, LatchInput.ALU_OUT)
-                        self.data_path.latch_next(instruction, LatchInput.MA_OUT)
-                        self.data_path.latch_od_shp(LatchInput.OD_SHP_DEC)
-                    case 2:
-                        self.data_path.latch_memory_data(instruction, LatchInput.TOP)
-                        self.data_path.latch_ip(instruction, LatchInput.IP_INC)
-                        return True
-                    case _:
-                        raise "fatal exception"
-            case Opcode.SHIFT_BACK:
-                self.data_path.latch_top(instruction, LatchInput.NEXT)
-                self.data_path.latch_next(instruction, LatchInput.MA_OUT)
-                self.data_path.latch_od_shp(LatchInput.OD_SHP_DEC)
-                self.data_path.latch_ip(instruction, LatchInput.IP_INC)
-                return True
-            case Opcode.PUT | Opcode.PUT_ABSOLUTE:
-                match self.data_path.instruction_stage_number:
-                    case 1:
-                        self.data_path.latch_memory_data(instruction, LatchInput.NEXT)
-                        self.data_path.latch_od_shp(LatchInput.OD_SHP_MINUS_TWO)
-                    case 2:
-                        self.data_path.latch_top(instruction, LatchInput.MA_OUT)
-                        self.data_path.latch_next(instruction, LatchInput.MA_MINUS_ONE_OUT)
-                        self.data_path.latch_ip(instruction, LatchInput.IP_INC)
-                        return True
-                    case _:
-                        raise "fatal exception"
-            case Opcode.PICK | Opcode.PICK_ABSOLUTE:
-                match self.data_path.instruction_stage_number:
-                    case 1:
-                        self.data_path.latch_top(instruction, LatchInput.MA_OUT)
-                    case 2:
-                        self.data_path.latch_memory_data(instruction, LatchInput.TOP)
-                        self.data_path.latch_ip(instruction, LatchInput.IP_INC)
-                        return True
-                    case _:
-                        raise "fatal exception"
-            case Opcode.SWAP:
-                match self.data_path.instruction_stage_number:
-                    case 1:
-                        self.data_path.latch_next(instruction, LatchInput.TOP)
-                        self.data_path.latch_top(instruction, LatchInput.NEXT)
-                        self.data_path.latch_memory_data(instruction, LatchInput.TOP)
-                    case 2:
-                        self.data_path.latch_memory_data(instruction, LatchInput.TOP)
-                        self.data_path.latch_ip(instruction, LatchInput.IP_INC)
-                        return True
-                    case _:
-                        raise "fatal exception"
             case _:
                 raise "fatal exception"
         return False
 
-    def pra_maniputation_instractions_exec(self, instruction: Instruction) -> bool:
-        match instruction.opcode:
-            case Opcode.PUSH_INC_INC_IP_TO_PRA_SHP:
-                self.data_path.latch_memory_data(instruction, LatchInput.IP_PLUS_TWO)
-                self.data_path.latch_pra_shp(LatchInput.PRA_SHP_DEC)
-                self.data_path.latch_ip(instruction, LatchInput.IP_INC)
+    def shift_back_exec(self, instruction: Instruction) -> bool:
+        data_path = self.data_path
+        data_path.latch_top(instruction, LatchInput.NEXT)
+        data_path.latch_next(instruction, LatchInput.MA_OUT)
+        data_path.latch_od_shp(LatchInput.OD_SHP_DEC)
+        data_path.latch_ip(instruction, LatchInput.IP_INC)
+        return True
+
+    def put_exec(self, instruction: Instruction) -> bool:
+        data_path = self.data_path
+        match data_path.instruction_stage_number:
+            case 1:
+                data_path.latch_memory_data(instruction, LatchInput.NEXT)
+                data_path.latch_od_shp(LatchInput.OD_SHP_MINUS_TWO)
+            case 2:
+                data_path.latch_top(instruction, LatchInput.MA_OUT)
+                data_path.latch_next(instruction, LatchInput.MA_MINUS_ONE_OUT)
+                data_path.latch_ip(instruction, LatchInput.IP_INC)
                 return True
-            case Opcode.INCREMENT_RET | Opcode.DECREMENT_RET:
-                match self.data_path.instruction_stage_number:
-                    case 1:
-                        self.data_path.latch_top(instruction, LatchInput.MA_OUT)
-                    case 2:
-                        self.data_path.latch_memory_data(instruction, LatchInput.ALU_OUT)
-                    case 3:
-                        self.data_path.latch_top(instruction, LatchInput.MA_OUT)
-                        self.data_path.latch_ip(instruction, LatchInput.IP_INC)
-                        return True
-                    case _:
-                        raise "fatal exception"
-            case Opcode.EQ_NOT_CONSUMING_RET:
-                match self.data_path.instruction_stage_number:
-                    case 1:
-                        self.data_path.latch_top(instruction, LatchInput.ALU_OUT)
-                        self.data_path.latch_pra_shp(LatchInput.PRA_SHP_DEC)
-                    case 2:
-                        self.data_path.latch_memory_data(instruction, LatchInput.TOP)
-                    case 3:
-                        self.data_path.latch_top(instruction, LatchInput.MA_OUT)
-                        self.data_path.latch_ip(instruction, LatchInput.IP_INC)
-                        return True
-                    case _:
-                        raise "fatal exception"
-            case Opcode.POP_TO_RET:
-                match self.data_path.instruction_stage_number:
-                    case 1:
-                        self.data_path.latch_memory_data(instruction, LatchInput.TOP)
-                        self.data_path.latch_pra_shp(LatchInput.PRA_SHP_DEC)
-                        self.data_path.latch_top(instruction, LatchInput.NEXT)
-                        self.data_path.latch_od_shp(LatchInput.OD_SHP_DEC)
-                    case 2:
-                        self.data_path.latch_next(instruction, LatchInput.MA_MINUS_ONE_OUT)
-                        self.data_path.latch_ip(instruction, LatchInput.IP_INC)
-                        return True
-                    case _:
-                        raise "fatal exception"
-            case Opcode.PUSH_TO_OD:
-                match self.data_path.instruction_stage_number:
-                    case 1:
-                        self.data_path.latch_top(instruction, LatchInput.MA_OUT)
-                        self.data_path.latch_od_shp(LatchInput.OD_SHP_INC)
-                    case 2:
-                        self.data_path.latch_memory_data(instruction, LatchInput.TOP)
-                    case 3:
-                        self.data_path.latch_next(instruction, LatchInput.MA_MINUS_ONE_OUT)
-                        self.data_path.latch_ip(instruction, LatchInput.IP_INC)
-                        return True
-                    case _:
-                        raise "fatal exception"
-            case Opcode.SHIFT_BACK_RET:
-                self.data_path.latch_pra_shp(LatchInput.PRA_SHP_INC)
-                self.data_path.latch_ip(instruction, LatchInput.IP_INC)
+            case _:
+                raise "fatal exception"
+        return False
+
+    def pick_exec(self, instruction: Instruction) -> bool:
+        data_path = self.data_path
+        match data_path.instruction_stage_number:
+            case 1:
+                data_path.latch_top(instruction, LatchInput.MA_OUT)
+            case 2:
+                data_path.latch_memory_data(instruction, LatchInput.TOP)
+                data_path.latch_ip(instruction, LatchInput.IP_INC)
                 return True
             case _:
                 raise "fatal exception"
         return False
 
-    def port_instructions_exec(self, instruction: Instruction) -> bool:
-        match instruction.opcode:
-            case Opcode.READ_PORT:
-                self.data_path.latch_next(instruction, LatchInput.TOP)
-                self.data_path.latch_top(instruction, LatchInput.PORT_VALUE)
-                self.data_path.latch_memory_data(instruction, LatchInput.PORT_VALUE)
-                self.data_path.latch_port_flags(instruction, LatchInput.FALSE)
-                self.data_path.latch_od_shp(LatchInput.OD_SHP_INC)
-                self.data_path.latch_ip(instruction, LatchInput.IP_INC)
+    def swap_exec(self, instruction: Instruction) -> bool:
+        data_path = self.data_path
+        match data_path.instruction_stage_number:
+            case 1:
+                data_path.latch_next(instruction, LatchInput.TOP)
+                data_path.latch_top(instruction, LatchInput.NEXT)
+                data_path.latch_memory_data(instruction, LatchInput.TOP)
+            case 2:
+                data_path.latch_memory_data(instruction, LatchInput.TOP)
+                data_path.latch_ip(instruction, LatchInput.IP_INC)
                 return True
-            case Opcode.WRITE_PORT:
-                self.data_path.latch_port_value(instruction, LatchInput.TOP)
-                self.data_path.latch_top(instruction, LatchInput.NEXT)
-                self.data_path.latch_next(instruction, LatchInput.MA_MINUS_ONE_OUT)
-                self.data_path.latch_port_flags(instruction, LatchInput.TRUE)
-                self.data_path.latch_od_shp(LatchInput.OD_SHP_DEC)
-                self.data_path.latch_ip(instruction, LatchInput.IP_INC)
+            case _:
+                raise "fatal exception"
+        return False
+
+    def push_inc_inc_ip_to_pra_shp_exec(self, instruction: Instruction) -> bool:
+        data_path = self.data_path
+        data_path.latch_memory_data(instruction, LatchInput.IP_PLUS_TWO)
+        data_path.latch_pra_shp(LatchInput.PRA_SHP_DEC)
+        data_path.latch_ip(instruction, LatchInput.IP_INC)
+        return True
+
+    def increment_ret_exec(self, instruction: Instruction) -> bool:
+        data_path = self.data_path
+        match data_path.instruction_stage_number:
+            case 1:
+                data_path.latch_top(instruction, LatchInput.MA_OUT)
+            case 2:
+                data_path.latch_memory_data(instruction, LatchInput.ALU_OUT)
+            case 3:
+                data_path.latch_top(instruction, LatchInput.MA_OUT)
+                data_path.latch_ip(instruction, LatchInput.IP_INC)
                 return True
-            case Opcode.HAS_PORT_FILLED_WITH_CPU | Opcode.HAS_PORT_FILLED_WITH_DEVICE:
-                self.data_path.latch_next(instruction, LatchInput.TOP)
-                match instruction.opcode:
-                    case Opcode.HAS_PORT_FILLED_WITH_CPU:
-                        self.data_path.latch_memory_data(instruction, LatchInput.HAS_DEVICE_FILLED_WITH_CPU)
-                        self.data_path.latch_top(instruction, LatchInput.HAS_DEVICE_FILLED_WITH_CPU)
-                    case Opcode.HAS_PORT_FILLED_WITH_DEVICE:
-                        self.data_path.latch_memory_data(instruction, LatchInput.HAS_PORT_FILLED_WITH_DEVICE)
-                        self.data_path.latch_top(instruction, LatchInput.HAS_PORT_FILLED_WITH_DEVICE)
-                    case _:
-                        raise "fatal exception"
-                self.data_path.latch_od_shp(LatchInput.OD_SHP_INC)
-                self.data_path.latch_ip(instruction, LatchInput.IP_INC)
+            case _:
+                raise "fatal exception"
+        return False
+
+    def eq_not_consuming_ret_exec(self, instruction: Instruction) -> bool:
+        data_path = self.data_path
+        match data_path.instruction_stage_number:
+            case 1:
+                data_path.latch_top(instruction, LatchInput.ALU_OUT)
+                data_path.latch_pra_shp(LatchInput.PRA_SHP_DEC)
+            case 2:
+                data_path.latch_memory_data(instruction, LatchInput.TOP)
+            case 3:
+                data_path.latch_top(instruction, LatchInput.MA_OUT)
+                data_path.latch_ip(instruction, LatchInput.IP_INC)
                 return True
             case _:
                 raise "fatal exception"
         return False
 
-    def vardata_instructions_exec(self, instruction: Instruction) -> bool:
-        match instruction.opcode:
-            case Opcode.READ_VARDATA:
-                match self.data_path.instruction_stage_number:
-                    case 1:
-                        self.data_path.latch_next(instruction, LatchInput.TOP)
-                        self.data_path.latch_top(instruction, LatchInput.MA_OUT)
-                    case 2:
-                        self.data_path.latch_memory_data(instruction, LatchInput.TOP)
-                        self.data_path.latch_od_shp(LatchInput.OD_SHP_INC)
-                        self.data_path.latch_ip(instruction, LatchInput.IP_INC)
-                        return True
-            case Opcode.WRITE_VARDATA:
-                match self.data_path.instruction_stage_number:
-                    case 1:
-                        self.data_path.latch_memory_data(instruction, LatchInput.TOP)
-                        self.data_path.latch_top(instruction, LatchInput.NEXT)
-                    case 2:
-                        self.data_path.latch_next(instruction, LatchInput.MA_MINUS_ONE_OUT)
-                        self.data_path.latch_od_shp(LatchInput.OD_SHP_DEC)
-                        self.data_path.latch_ip(instruction, LatchInput.IP_INC)
-                        return True
-            case Opcode.SUM_TOP_WITH_VDSP:
-                self.data_path.latch_top(instruction, LatchInput.VDSP_PLUS_TOP)
-                self.data_path.latch_memory_data(instruction, LatchInput.VDSP_PLUS_TOP)
-                self.data_path.latch_ip(instruction, LatchInput.IP_INC)
+    def pop_to_ret_exec(self, instruction: Instruction) -> bool:
+        data_path = self.data_path
+        match data_path.instruction_stage_number:
+            case 1:
+                data_path.latch_memory_data(instruction, LatchInput.TOP)
+                data_path.latch_pra_shp(LatchInput.PRA_SHP_DEC)
+                data_path.latch_top(instruction, LatchInput.NEXT)
+                data_path.latch_od_shp(LatchInput.OD_SHP_DEC)
+            case 2:
+                data_path.latch_next(instruction, LatchInput.MA_MINUS_ONE_OUT)
+                data_path.latch_ip(instruction, LatchInput.IP_INC)
                 return True
             case _:
                 raise "fatal exception"
         return False
 
-    def dup_instructions_exec(self, instruction: Instruction) -> bool:
-        match instruction.opcode:
-            case Opcode.DUP_RET:
-                match self.data_path.instruction_stage_number:
-                    case 1:
-                        self.data_path.latch_top(instruction, LatchInput.MA_OUT)
-                    case 2:
-                        self.data_path.latch_memory_data(instruction, LatchInput.TOP)
-                        self.data_path.latch_pra_shp(LatchInput.PRA_SHP_INC)
-                    case 3:
-                        self.data_path.latch_top(instruction, LatchInput.MA_OUT)
-                        self.data_path.latch_ip(instruction, LatchInput.IP_INC)
-                        return True
-                    case _:
-                        raise "fatal exception"
-            case Opcode.DUP:
-                self.data_path.latch_next(instruction, LatchInput.TOP)
-                self.data_path.latch_memory_data(instruction, LatchInput.TOP)
-                self.data_path.latch_od_shp(LatchInput.OD_SHP_INC)
-                self.data_path.latch_ip(instruction, LatchInput.IP_INC)
+    def push_to_od_exec(self, instruction: Instruction) -> bool:
+        data_path = self.data_path
+        match data_path.instruction_stage_number:
+            case 1:
+                data_path.latch_top(instruction, LatchInput.MA_OUT)
+                data_path.latch_od_shp(LatchInput.OD_SHP_INC)
+            case 2:
+                data_path.latch_memory_data(instruction, LatchInput.TOP)
+            case 3:
+                data_path.latch_next(instruction, LatchInput.MA_MINUS_ONE_OUT)
+                data_path.latch_ip(instruction, LatchInput.IP_INC)
                 return True
-            case Opcode.DUDUP:
-                match self.data_path.instruction_stage_number:
-                    case 1:
-                        self.data_path.latch_memory_data(instruction, LatchInput.NEXT)
-                        self.data_path.latch_od_shp(LatchInput.OD_SHP_INC)
-                    case 2:
-                        self.data_path.latch_memory_data(instruction, LatchInput.TOP)
-                        self.data_path.latch_od_shp(LatchInput.OD_SHP_INC)
-                        self.data_path.latch_ip(instruction, LatchInput.IP_INC)
-                        return True
-                    case _:
-                        raise "fatal exception"
             case _:
                 raise "fatal exception"
         return False
 
-    def ip_changing_instructions_exec(self, instruction: Instruction) -> bool:
+    def shift_back_ret_exec(self, instruction: Instruction) -> bool:
+        data_path = self.data_path
+        data_path.latch_pra_shp(LatchInput.PRA_SHP_INC)
+        data_path.latch_ip(instruction, LatchInput.IP_INC)
+        return True
+
+    def read_port_exec(self, instruction: Instruction) -> bool:
+        data_path = self.data_path
+        data_path.latch_next(instruction, LatchInput.TOP)
+        data_path.latch_top(instruction, LatchInput.PORT_VALUE)
+        data_path.latch_memory_data(instruction, LatchInput.PORT_VALUE)
+        data_path.latch_port_flags(instruction, LatchInput.FALSE)
+        data_path.latch_od_shp(LatchInput.OD_SHP_INC)
+        data_path.latch_ip(instruction, LatchInput.IP_INC)
+        return True
+
+    def write_port_exec(self, instruction: Instruction) -> bool:
+        data_path = self.data_path
+        data_path.latch_port_value(instruction, LatchInput.TOP)
+        data_path.latch_top(instruction, LatchInput.NEXT)
+        data_path.latch_next(instruction, LatchInput.MA_MINUS_ONE_OUT)
+        data_path.latch_port_flags(instruction, LatchInput.TRUE)
+        data_path.latch_od_shp(LatchInput.OD_SHP_DEC)
+        data_path.latch_ip(instruction, LatchInput.IP_INC)
+        return True
+
+    def has_port_filled_exec(self, instruction: Instruction) -> bool:
+        data_path = self.data_path
+        data_path.latch_next(instruction, LatchInput.TOP)
         match instruction.opcode:
-            case Opcode.JMP:
-                self.data_path.latch_ip(instruction, LatchInput.IP_PLUS_ARG)
+            case Opcode.HAS_PORT_FILLED_WITH_CPU:
+                data_path.latch_memory_data(instruction, LatchInput.HAS_DEVICE_FILLED_WITH_CPU)
+                data_path.latch_top(instruction, LatchInput.HAS_DEVICE_FILLED_WITH_CPU)
+            case Opcode.HAS_PORT_FILLED_WITH_DEVICE:
+                data_path.latch_memory_data(instruction, LatchInput.HAS_PORT_FILLED_WITH_DEVICE)
+                data_path.latch_top(instruction, LatchInput.HAS_PORT_FILLED_WITH_DEVICE)
+            case _:
+                raise "fatal exception"
+        data_path.latch_od_shp(LatchInput.OD_SHP_INC)
+        data_path.latch_ip(instruction, LatchInput.IP_INC)
+        return True
+
+    def read_vardata_exec(self, instruction: Instruction) -> bool:
+        data_path = self.data_path
+        match data_path.instruction_stage_number:
+            case 1:
+                data_path.latch_next(instruction, LatchInput.TOP)
+                data_path.latch_top(instruction, LatchInput.MA_OUT)
+            case 2:
+                data_path.latch_memory_data(instruction, LatchInput.TOP)
+                data_path.latch_od_shp(LatchInput.OD_SHP_INC)
+                data_path.latch_ip(instruction, LatchInput.IP_INC)
+                return True
+        return False
+
+    def write_vardata_exec(self, instruction: Instruction) -> bool:
+        data_path = self.data_path
+        match data_path.instruction_stage_number:
+            case 1:
+                data_path.latch_memory_data(instruction, LatchInput.TOP)
+                data_path.latch_top(instruction, LatchInput.NEXT)
+            case 2:
+                data_path.latch_next(instruction, LatchInput.MA_MINUS_ONE_OUT)
+                data_path.latch_od_shp(LatchInput.OD_SHP_DEC)
+                data_path.latch_ip(instruction, LatchInput.IP_INC)
                 return True
-            case Opcode.EXEC_IF | Opcode.EXEC_COND_JMP:
-                self.data_path.latch_next(instruction, LatchInput.MA_MINUS_ONE_OUT)
-                self.data_path.latch_ip(instruction, LatchInput.IP_CONV_SIG_SUM_INC)
-                self.data_path.latch_top(instruction, LatchInput.NEXT)
-                self.data_path.latch_od_shp(LatchInput.OD_SHP_DEC)
+        return False
+
+    def sum_top_with_vdsp_exec(self, instruction: Instruction) -> bool:
+        data_path = self.data_path
+        data_path.latch_top(instruction, LatchInput.VDSP_PLUS_TOP)
+        data_path.latch_memory_data(instruction, LatchInput.VDSP_PLUS_TOP)
+        data_path.latch_ip(instruction, LatchInput.IP_INC)
+        return True
+
+    def dup_ret_exec(self, instruction: Instruction) -> bool:
+        data_path = self.data_path
+        match data_path.instruction_stage_number:
+            case 1:
+                data_path.latch_top(instruction, LatchInput.MA_OUT)
+            case 2:
+                data_path.latch_memory_data(instruction, LatchInput.TOP)
+                data_path.latch_pra_shp(LatchInput.PRA_SHP_INC)
+            case 3:
+                data_path.latch_top(instruction, LatchInput.MA_OUT)
+                data_path.latch_ip(instruction, LatchInput.IP_INC)
                 return True
-            case Opcode.EXEC_COND_JMP_RET:
-                self.data_path.latch_ip(instruction, LatchInput.IP_CONV_SIG_SUM_INC)
-                self.data_path.latch_pra_shp(LatchInput.PRA_SHP_INC)
+            case _:
+                raise "fatal exception"
+        return False
+
+    def dup_exec(self, instruction: Instruction) -> bool:
+        data_path = self.data_path
+        data_path.latch_next(instruction, LatchInput.TOP)
+        data_path.latch_memory_data(instruction, LatchInput.TOP)
+        data_path.latch_od_shp(LatchInput.OD_SHP_INC)
+        data_path.latch_ip(instruction, LatchInput.IP_INC)
+        return True
+
+    def dudup_exec(self, instruction: Instruction) -> bool:
+        data_path = self.data_path
+        match data_path.instruction_stage_number:
+            case 1:
+                data_path.latch_memory_data(instruction, LatchInput.NEXT)
+                data_path.latch_od_shp(LatchInput.OD_SHP_INC)
+            case 2:
+                data_path.latch_memory_data(instruction, LatchInput.TOP)
+                data_path.latch_od_shp(LatchInput.OD_SHP_INC)
+                data_path.latch_ip(instruction, LatchInput.IP_INC)
+                return True
+            case _:
+                raise "fatal exception"
+        return False
+
+    def jmp_exec(self, instruction: Instruction) -> bool:
+        self.data_path.latch_ip(instruction, LatchInput.IP_PLUS_ARG)
+        return True
+
+    def exec_if_exec(self, instruction: Instruction) -> bool:
+        data_path = self.data_path
+        data_path.latch_next(instruction, LatchInput.MA_MINUS_ONE_OUT)
+        data_path.latch_ip(instruction, LatchInput.IP_CONV_SIG_SUM_INC)
+        data_path.latch_top(instruction, LatchInput.NEXT)
+        data_path.latch_od_shp(LatchInput.OD_SHP_DEC)
+        return True
+
+    def exec_cond_jmp_ret_exec(self, instruction: Instruction) -> bool:
+        data_path = self.data_path
+        data_path.latch_ip(instruction, LatchInput.IP_CONV_SIG_SUM_INC)
+        data_path.latch_pra_shp(LatchInput.PRA_SHP_INC)
+        return True
+
+    def jmp_pop_pra_shp_exec(self, instruction: Instruction) -> bool:
+        data_path = self.data_path
+        match data_path.instruction_stage_number:
+            case 1:
+                data_path.latch_top(instruction, LatchInput.MA_OUT)
+                data_path.latch_pra_shp(LatchInput.PRA_SHP_INC)
+            case 2:
+                data_path.latch_ip(instruction, LatchInput.TOP)
+                data_path.latch_top(instruction, LatchInput.MA_OUT)
                 return True
-            case Opcode.JMP_POP_PRA_SHP:
-                match self.data_path.instruction_stage_number:
-                    case 1:
-                        self.data_path.latch_top(instruction, LatchInput.MA_OUT)
-                        self.data_path.latch_pra_shp(LatchInput.PRA_SHP_INC)
-                    case 2:
-                        self.data_path.latch_ip(instruction, LatchInput.TOP)
-                        self.data_path.latch_top(instruction, LatchInput.MA_OUT)
-                        return True
-                    case _:
-                        raise "fatal exception"
             case _:
                 raise "fatal exception"
         return False
 
     def __repr__(self):
         """Вернуть строковое представление состояния процессора."""
+        data_path = self.data_path
         top_reg = "None"
         next_reg = "None"
-        od_sh_size = self.data_path.od_sh_pointer - self.data_path.od_stack_start
+        od_sh_size = data_path.od_sh_pointer - data_path.od_stack_start
         if od_sh_size > 0:
-            top_reg = self.data_path.top
+            top_reg = data_path.top
         if od_sh_size > 1:
-            next_reg = self.data_path.next
-        state_repr = "instrs: {:6} ticks: {:6} ISN: {:3} IP: {:3} OD_SHP: {:3} PRA_SHP: {:3} TOP: {:4} NEXT: {:4} els below OD_SHP: {}, els over PRA_SHP: {}, VDStartP: {}".format(
-            self.instructions_counter,
-            self.ticks_counter,
-            self.data_path.instruction_stage_number,
-            self.data_path.instruction_pointer,
-            self.data_path.od_sh_pointer,
-            self.data_path.pra_shp_pointer,
-            top_reg,
-            next_reg,
-            " ".join(
-                [
-                    str(i)
-                    for i in self.data_path.data_memory[
-                        self.data_path.od_stack_start : self.data_path.od_sh_pointer + 1
-                    ]
-                ]
-            ),
-            " ".join([str(i) for i in self.data_path.data_memory[self.data_path.pra_shp_pointer :]]),
-            self.data_path.var_data_start_point,
+            next_reg = data_path.next
+        od_stack_repr = " ".join(
+            map(str, data_path.data_memory[data_path.od_stack_start : data_path.od_sh_pointer + 1])
+        )
+        pra_stack_repr = " ".join(map(str, data_path.data_memory[data_path.pra_shp_pointer :]))
+        state_repr = (
+            f"instrs: {self.instructions_counter:6} ticks: {self.ticks_counter:6} "
+            f"ISN: {data_path.instruction_stage_number:3} IP: {data_path.instruction_pointer:3} "
+            f"OD_SHP: {data_path.od_sh_pointer:3} PRA_SHP: {data_path.pra_shp_pointer:3} "
+            f"TOP: {top_reg:4} NEXT: {next_reg:4} "
+            f"els below OD_SHP: {od_stack_repr}, els over PRA_SHP: {pra_stack_repr}, "
+            f"VDStartP: {data_path.var_data_start_point}"
         )
 
-        instr: Instruction = self.data_path.data_memory[self.data_path.instruction_pointer]
-        instr_repr = instr.opcode
+        instr: Instruction = data_path.data_memory[data_path.instruction_pointer]
+        instr_repr = str(instr.opcode)
 
         if instr.arg is not None:
             instr_repr += f" {instr.arg}"
@@ -894,33 +871,67 @@ class ControlUnit:
         return f"{state_repr} \t{instr_repr}"
 
     def step_in_port_interruption(self, port_number: int, is_write_interruption: bool):
+        data_path = self.data_path
         port_interruption_memory_index = 2 * port_number
         if is_write_interruption:
-            handler_start_pc = self.data_path.data_memory[port_interruption_memory_index]
+            handler_start_pc = data_path.data_memory[port_interruption_memory_index]
         else:
-            handler_start_pc = self.data_path.data_memory[port_interruption_memory_index + 1]
+            handler_start_pc = data_path.data_memory[port_interruption_memory_index + 1]
         # tick 1
-        self.data_path.pra_shp_pointer -= 1
-        self.data_path.data_memory[self.data_path.pra_shp_pointer] = self.data_path.instruction_pointer
-        self.data_path.instruction_pointer = handler_start_pc
+        data_path.pra_shp_pointer -= 1
+        data_path.data_memory[data_path.pra_shp_pointer] = data_path.instruction_pointer
+        data_path.instruction_pointer = handler_start_pc
         # tick 2
-        self.data_path.pra_shp_pointer -= 1
-        self.data_path.data_memory[self.data_path.pra_shp_pointer] = self.data_path.instruction_stage_number
-        self.data_path.instruction_stage_number = 1
-
-
-def signal_to_bit(signal: bool) -> int:
-    return 1 if signal else 0
-
-
-def bit_to_signal(bit: int) -> bool:
-    match bit:
-        case 0:
-            return False
-        case 1:
-            return True
-        case _:
-            raise "bit should be 0 or 1"
+        data_path.pra_shp_pointer -= 1
+        data_path.data_memory[data_path.pra_shp_pointer] = data_path.instruction_stage_number
+        data_path.instruction_stage_number = 1
+
+
+INSTRUCTION_EXECUTORS: dict[Opcode, Callable[[ControlUnit, Instruction], bool]] = {
+    Opcode.NUMBER: ControlUnit.number_exec,
+    Opcode.SUM: ControlUnit.alu_instruction_exec,
+    Opcode.DIFF: ControlUnit.alu_instruction_exec,
+    Opcode.DIV: ControlUnit.alu_instruction_exec,
+    Opcode.MUL: ControlUnit.alu_instruction_exec,
+    Opcode.MOD: ControlUnit.alu_instruction_exec,
+    Opcode.EQ: ControlUnit.alu_instruction_exec,
+    Opcode.NEQ: ControlUnit.alu_instruction_exec,
+    Opcode.LESS: ControlUnit.alu_instruction_exec,
+    Opcode.GR: ControlUnit.alu_instruction_exec,
+    Opcode.LE: ControlUnit.alu_instruction_exec,
+    Opcode.GE: ControlUnit.alu_instruction_exec,
+    Opcode.SHIFT_BACK: ControlUnit.shift_back_exec,
+    Opcode.PUT: ControlUnit.put_exec,
+    Opcode.PUT_ABSOLUTE: ControlUnit.put_exec,
+    Opcode.PICK: ControlUnit.pick_exec,
+    Opcode.PICK_ABSOLUTE: ControlUnit.pick_exec,
+    Opcode.SWAP: ControlUnit.swap_exec,
+    Opcode.PUSH_INC_INC_IP_TO_PRA_SHP: ControlUnit.push_inc_inc_ip_to_pra_shp_exec,
+    Opcode.INCREMENT_RET: ControlUnit.increment_ret_exec,
+    Opcode.DECREMENT_RET: ControlUnit.increment_ret_exec,
+    Opcode.EQ_NOT_CONSUMING_RET: ControlUnit.eq_not_consuming_ret_exec,
+    Opcode.POP_TO_RET: ControlUnit.pop_to_ret_exec,
+    Opcode.PUSH_TO_OD: ControlUnit.push_to_od_exec,
+    Opcode.SHIFT_BACK_RET: ControlUnit.shift_back_ret_exec,
+    Opcode.READ_PORT: ControlUnit.read_port_exec,
+    Opcode.WRITE_PORT: ControlUnit.write_port_exec,
+    Opcode.HAS_PORT_FILLED_WITH_CPU: ControlUnit.has_port_filled_exec,
+    Opcode.HAS_PORT_FILLED_WITH_DEVICE: ControlUnit.has_port_filled_exec,
+    Opcode.READ_VARDATA: ControlUnit.read_vardata_exec,
+    Opcode.WRITE_VARDATA: ControlUnit.write_vardata_exec,
+    Opcode.SUM_TOP_WITH_VDSP: ControlUnit.sum_top_with_vdsp_exec,
+    Opcode.DUP_RET: ControlUnit.dup_ret_exec,
+    Opcode.DUP: ControlUnit.dup_exec,
+    Opcode.DUDUP: ControlUnit.dudup_exec,
+    Opcode.JMP: ControlUnit.jmp_exec,
+    Opcode.EXEC_IF: ControlUnit.exec_if_exec,
+    Opcode.EXEC_COND_JMP: ControlUnit.exec_if_exec,
+    Opcode.EXEC_COND_JMP_RET: ControlUnit.exec_cond_jmp_ret_exec,
+    Opcode.JMP_POP_PRA_SHP: ControlUnit.jmp_pop_pra_shp_exec,
+}
+"Исполнители тика инструкции для каждого кода инструкции, кроме HALT"
+
+assert set(INSTRUCTION_EXECUTORS) == set(Opcode) - {Opcode.HALT}, "Every opcode except HALT should have an executor"
 
 
 def simulation(
@@ -964,12 +975,17 @@ def simulation(
 def do_simulation(control_unit: ControlUnit, trimmed_input_tokens: dict[int, int], ticks_limit: int):
     main_port_number = 0
     data_path = control_unit.data_path
+    # связи портов и методов не меняются во время моделирования, поэтому достаются из объектов один раз
+    main_port = data_path.ports[main_port_number]
+    next_tick_execute = control_unit.next_tick_execute
+    # состояние процессора форматируется на каждом тике, поэтому уровень журнала проверяется один раз
+    is_tick_log_enabled = logging.getLogger().isEnabledFor(logging.DEBUG)
     while control_unit.ticks_counter < ticks_limit:
         if control_unit.ticks_counter in trimmed_input_tokens:
-            if not control_unit.data_path.is_in_interruption:
-                control_unit.data_path.latch_is_in_interruption(LatchInput.TRUE)
-                control_unit.data_path.ports[main_port_number].data = trimmed_input_tokens[control_unit.ticks_counter]
-                control_unit.data_path.ports[main_port_number].filled_with_device = True
+            if not data_path.is_in_interruption:
+                data_path.latch_is_in_interruption(LatchInput.TRUE)
+                main_port.data = trimmed_input_tokens[control_unit.ticks_counter]
+                main_port.filled_with_device = True
                 control_unit.step_in_port_interruption(main_port_number, True)
                 control_unit.ticks_counter += 3  # ticks for port interruption
                 logging.debug("Write interruption!!! %s", control_unit)
@@ -978,57 +994,70 @@ def do_simulation(control_unit: ControlUnit, trimmed_input_tokens: dict[int, int
                 'WRITE OF SYMBOL "%s" is IGNORED (IN INTERRUPTION)!!!',
                 chr(trimmed_input_tokens[control_unit.ticks_counter]),
             )
-        control_unit.next_tick_execute()
-        logging.debug("%s", control_unit)
-        if data_path.ports[main_port_number].filled_with_cpu:
-            char_to_print = chr(data_path.ports[main_port_number].data)
+        next_tick_execute()
+        if is_tick_log_enabled:
+            logging.debug("%s", control_unit)
+        if main_port.filled_with_cpu:
+            char_to_print = chr(main_port.data)
             logging.debug("Printed: %s", char_to_print)
             if ord(char_to_print) == 13:
                 print()
             else:
                 print(char_to_print, end="", flush=True)
-            data_path.ports[main_port_number].filled_with_cpu = False
-            control_unit.data_path.latch_is_in_interruption(LatchInput.TRUE)
+            main_port.filled_with_cpu = False
+            data_path.latch_is_in_interruption(LatchInput.TRUE)
             control_unit.step_in_port_interruption(main_port_number, False)  # 1 instruction
             logging.debug("Read interruption!!! %s", control_unit)
             control_unit.ticks_counter += 3
             continue
 
 
+def parse_input_token(line: str) -> tuple[int, int]:
+    """Разобрать строку файла ввода: индекс тика и вводимый символ"""
+    sp = line.strip().split(" ")
+    assert len(sp) == 2
+    instruction_number = int(sp[0])
+    key = sp[1]
+    return instruction_number, ord(key)
+
+
 def main(code_file: str, input_file: str, ports_interruption_handlers_files: list[str]):
     """Функция запуска модели процессора
     input_file - это файл, в котором каждая строчка представляет собой пару из индекса тика,
     перед которым выполняется ввод, и сам вводимый символ"""
     program = read_code(code_file)
-    input_tokens: list[tuple[int, int]] = []
     with open(input_file, encoding="utf-8") as file:
-        lines = file.readlines()
-        for line in lines:
-            sp = line.strip().split(" ")
-            assert len(sp) == 2
-            instruction_number = int(sp[0])
-            key = sp[1]
-            input_tokens.append((instruction_number, ord(key)))
-    input_tokens = sorted(input_tokens, key=lambda x: x[0])
-    ports_description: list[(list[Instruction], list[Instruction])] = []
-    for i in range(0, len(ports_interruption_handlers_files), 2):
-        output_interruption_code = read_code(ports_interruption_handlers_files[i])
-        input_interruption_code = read_code(ports_interruption_handlers_files[i + 1])
-        ports_description.append((output_interruption_code, input_interruption_code))
+        input_tokens = [parse_input_token(line) for line in file]
+    input_tokens.sort(key=lambda x: x[0])
+    ports_description: list[tuple[list[Instruction], list[Instruction]]] = [
+        (read_code(output_interruption_file), read_code(input_interruption_file))
+        for output_interruption_file, input_interruption_file in zip(
+            ports_interruption_handlers_files[0::2], ports_interruption_handlers_files[1::2]
+        )
+    ]
 
     simulation(1000, 100, ports_description, program, input_tokens, 1000000)
 
 
 if __name__ == "__main__":
-    logging.basicConfig(filename="log.log", filemode="w", level=logging.DEBUG)
-    logging.getLogger().setLevel(logging.DEBUG)
-    bad_args_exception_text = (
-        "Wrong arguments: machine.py <code_file> <input_file> "
-        "<emit-port-interruption-handler> <key-port-interruption-handler> "
-        "[<output-port-interruption-handler> <input-port-interruption-handler]*"
+    parser = argparse.ArgumentParser(description="Tick-accurate processor model")
+    parser.add_argument("code_file", help="machine code file")
+    parser.add_argument("input_file", help="input schedule: <tick> <char> per line")
+    parser.add_argument(
+        "ports_interruption_handlers_files",
+        nargs="+",
+        metavar="handler",
+        help="port interruption handlers in pairs: <output-port-handler> <input-port-handler>",
+    )
+    parser.add_argument("--log", default="log.log", help="file to write the tick log to (default: log.log)")
+    parser.add_argument(
+        "--log-level",
+        default="DEBUG",
+        choices=["DEBUG", "INFO", "WARNING"],
+        help="journal level; anything above DEBUG skips the per-tick log (default: DEBUG)",
     )
-    assert len(sys.argv) >= 4, bad_args_exception_text
-    assert (len(sys.argv) - 3) % 2 == 0, bad_args_exception_text
-    _, code_file, input_file = sys.argv[:3]
-    ports_interruption_handlers_files = sys.argv[3:]
-    main(code_file, input_file, ports_interruption_handlers_files)
+    args = parser.parse_args()
+    if len(args.ports_interruption_handlers_files) % 2 != 0:
+        parser.error("port interruption handlers should be given in pairs: <output-handler> <input-handler>")
+    logging.basicConfig(filename=args.log, filemode="w", level=args.log_level)
+    main(args.code_file, args.input_file, args.ports_interruption_handlers_files)
@@ -1,10 +1,38 @@
 from __future__ import annotations
 
+import argparse
 import re
-import sys
 
 from isa import Instruction, Opcode, Term, write_code
 
+SIGN_AND_COMPARATOR_OPCODES: dict[str, Opcode] = {
+    "+": Opcode.SUM,
+    "-": Opcode.DIFF,
+    "*": Opcode.MUL,
+    "/": Opcode.DIV,
+    "=": Opcode.EQ,
+    ">": Opcode.GR,
+    ">=": Opcode.GE,
+    "<": Opcode.LESS,
+    "<=": Opcode.LE,
+    "<>": Opcode.NEQ,
+}
+"Инструкции арифметических знаков и операторов сравнения"
+
+BUILT_IN_NO_ARG_OPCODES: dict[str, Opcode] = {
+    "mod": Opcode.MOD,
+    "put": Opcode.PUT,
+    "put_absolute": Opcode.PUT_ABSOLUTE,
+    "pick": Opcode.PICK,
+    "pick_absolute": Opcode.PICK_ABSOLUTE,
+    "sum_top_with_vdsp": Opcode.SUM_TOP_WITH_VDSP,
+    "swap": Opcode.SWAP,
+    "drop": Opcode.SHIFT_BACK,
+    "dup": Opcode.DUP,
+    "dudup": Opcode.DUDUP,
+}
+"Инструкции встроенных слов без аргумента"
+
 
 def is_int56(value: int) -> bool:
     if value < 0:
@@ -369,13 +397,14 @@ def translate(lines):
     for word, pcs in word_jmp_pcs.items():
         def_pc = word_def_pc[word]
         for pc in pcs:
-            code[pc].arg = def_pc - pc
+            code[pc] = code[pc]._replace(arg=def_pc - pc)
 
     var_busy_cells_count = 0
     for variable_name, terms_desc in vars_pcs.items():
         max_size = 0
         for term_desc in terms_desc:
-            code[term_desc["pc"]].arg = var_busy_cells_count
+            var_pc = term_desc["pc"]
+            code[var_pc] = code[var_pc]._replace(arg=var_busy_cells_count)
         for term_desc in terms_desc:
             max_size = max(max_size, term_desc["size"])
         var_busy_cells_count += max_size
@@ -423,7 +452,7 @@ def word_def_append(
     if term.name == ";":
         code.append(Instruction(pc, Opcode.JMP_POP_PRA_SHP, None, term))
         pc += 1
-        code[last_word_def_jmp_pc].arg = pc - last_word_def_jmp_pc
+        code[last_word_def_jmp_pc] = code[last_word_def_jmp_pc]._replace(arg=pc - last_word_def_jmp_pc)
     else:
         last_word_def_jmp_pc = pc
         code.append(Instruction(pc, Opcode.JMP, None, term))
@@ -500,57 +529,14 @@ def word_append(
 
 
 def sign_word_or_comparator_append(term: Term, code: list[Instruction], pc: int) -> [list[Instruction], int]:
-    opcode = None
-    match term.name:
-        case "+":
-            opcode = Opcode.SUM
-        case "-":
-            opcode = Opcode.DIFF
-        case "*":
-            opcode = Opcode.MUL
-        case "/":
-            opcode = Opcode.DIV
-        case "=":
-            opcode = Opcode.EQ
-        case ">":
-            opcode = Opcode.GR
-        case ">=":
-            opcode = Opcode.GE
-        case "<":
-            opcode = Opcode.LESS
-        case "<=":
-            opcode = Opcode.LE
-        case "<>":
-            opcode = Opcode.NEQ
-    code.append(Instruction(pc, opcode, None, term))
+    code.append(Instruction(pc, SIGN_AND_COMPARATOR_OPCODES.get(term.name), None, term))
     pc += 1
 
     return code, pc
 
 
 def if_built_in_common_commands_append(term: Term, code: list[Instruction], pc: int) -> [bool, int]:
-    no_arg_opcode = None
-    match term.name:
-        case "mod":
-            no_arg_opcode = Opcode.MOD
-        case "put":
-            no_arg_opcode = Opcode.PUT
-        case "put_absolute":
-            no_arg_opcode = Opcode.PUT_ABSOLUTE
-        case "pick":
-            no_arg_opcode = Opcode.PICK
-        case "pick_absolute":
-            no_arg_opcode = Opcode.PICK_ABSOLUTE
-        case "sum_top_with_vdsp":
-            no_arg_opcode = Opcode.SUM_TOP_WITH_VDSP
-        case "swap":
-            no_arg_opcode = Opcode.SWAP
-        case "drop":
-            no_arg_opcode = Opcode.SHIFT_BACK
-        case "dup":
-            no_arg_opcode = Opcode.DUP
-        case "dudup":
-            no_arg_opcode = Opcode.DUDUP
+    no_arg_opcode = BUILT_IN_NO_ARG_OPCODES.get(term.name)
     is_built_in = no_arg_opcode is not None
     if is_built_in:
         code.append(Instruction(pc, no_arg_opcode, None, term))
@@ -636,7 +622,7 @@ def if_middle_jmp_command_append(
             jmp_points.append(pc)
             code.append(Instruction(pc, Opcode.JMP, None, term))
             pc += 1
-            code[if_false_jmp_pc].arg = pc - if_false_jmp_pc
+            code[if_false_jmp_pc] = code[if_false_jmp_pc]._replace(arg=pc - if_false_jmp_pc)
         case "leave":
             leaves_points[-1].append(pc)
             code.append(Instruction(pc, Opcode.JMP, None, term))
@@ -653,7 +639,7 @@ def if_closing_jmp_command_append(
     match term.name:
         case "then":
             if_true_jmp_pc = jmp_points.pop()
-            code[if_true_jmp_pc].arg = pc - if_true_jmp_pc
+            code[if_true_jmp_pc] = code[if_true_jmp_pc]._replace(arg=pc - if_true_jmp_pc)
         case "until":
             code.append(Instruction(pc, Opcode.NUMBER, 0, term))
             pc += 1
@@ -664,13 +650,13 @@ def if_closing_jmp_command_append(
             # указывает на инструкцию до той, на которую нужно прыгнуть
             pc += 1
             for leave_pc in leaves_points[-1]:
-                code[leave_pc].arg = pc - leave_pc
+                code[leave_pc] = code[leave_pc]._replace(arg=pc - leave_pc)
             leaves_points.pop()
         case "mloop" | "loop":
             do_jmp_pc = jmp_points.pop()
             code, pc = exec_loop(code, term.name == "loop", pc, do_jmp_pc, term)
             for leave_pc in leaves_points[-1]:
-                code[leave_pc].arg = pc - leave_pc - 2  # -2 to delete (from, to) from stack
+                code[leave_pc] = code[leave_pc]._replace(arg=pc - leave_pc - 2)  # -2 to delete (from, to) from stack
             leaves_points.pop()
         case _:
             is_closing_block_commands = False
@@ -688,6 +674,8 @@ def main(source: str, target: str):
 
 
 if __name__ == "__main__":
-    assert len(sys.argv) == 3, "Wrong arguments: translator.py <input_file> <target_file>"
-    _, source, target = sys.argv
-    main(source, target)
+    parser = argparse.ArgumentParser(description="Forth-like language translator")
+    parser.add_argument("source", metavar="input_file", help="program source file")
+    parser.add_argument("target", metavar="target_file", help="machine code file to write")
+    args = parser.parse_args()
+    main(args.source, args.target)